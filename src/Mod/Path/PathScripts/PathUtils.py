@@ -28,6 +28,11 @@ import PathScripts.PathGeom as PathGeom
 import math
 import numpy
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
 from FreeCAD import Vector
 from PathScripts import PathLog
 from PySide import QtCore
@@ -917,42 +922,81 @@ class depth_params(object):
             return [stop] + depths
 
 
-def simplify3dLine(line, tolerance=1e-4):
-    """Simplify a line defined by a list of App.Vectors, while keeping the
-    maximum deviation from the original line within the defined tolerance.
-    Implementation of
-    https://en.wikipedia.org/wiki/Ramer%E2%80%93Douglas%E2%80%93Peucker_algorithm"""
-    stack = [(0, len(line) - 1)]
-    results = []
-
-    def processRange(start, end):
-        """Internal worker. Process a range of Vector indices within the
-        line."""
+def _simplify3dKernel(pts, toleranceSq):
+    """Internal worker for simplify3dLine. Operates on an (N,3) float array
+    and returns the keep mask of the surviving points, so it can be jit
+    compiled by numba when available. Distances are compared squared."""
+    n = pts.shape[0]
+    keep = numpy.zeros(n, numpy.bool_)
+    keep[0] = True
+    keep[n - 1] = True
+    # ranges on the stack partition the line, so n entries are enough
+    stack = numpy.empty((n + 1, 2), numpy.int32)
+    stack[0, 0] = 0
+    stack[0, 1] = n - 1
+    top = 1
+    while top > 0:
+        top -= 1
+        start = stack[top, 0]
+        end = stack[top, 1]
         if end - start < 2:
-            results.extend(line[start:end])
-            return
-        # Find point with maximum distance
+            for i in range(start, end):
+                keep[i] = True
+            continue
+        # Find point with maximum distance to the start-end segment
+        x0 = pts[start, 0]
+        y0 = pts[start, 1]
+        z0 = pts[start, 2]
+        dx = pts[end, 0] - x0
+        dy = pts[end, 1] - y0
+        dz = pts[end, 2] - z0
+        dd = dx * dx + dy * dy + dz * dz
         maxIndex, maxDistance = 0, 0.0
-        startPoint, endPoint = (line[start], line[end])
         for i in range(start + 1, end):
-            v = line[i]
-            distance = v.distanceToLineSegment(startPoint, endPoint).Length
+            px = pts[i, 0] - x0
+            py = pts[i, 1] - y0
+            pz = pts[i, 2] - z0
+            if dd > 0.0:
+                t = (px * dx + py * dy + pz * dz) / dd
+                if t < 0.0:
+                    t = 0.0
+                elif t > 1.0:
+                    t = 1.0
+            else:
+                t = 0.0
+            ex = px - t * dx
+            ey = py - t * dy
+            ez = pz - t * dz
+            distance = ex * ex + ey * ey + ez * ez
             if distance > maxDistance:
                 maxDistance = distance
                 maxIndex = i
-        if maxDistance > tolerance:
-            # Push second branch first, to be executed last
-            stack.append((maxIndex, end))
-            stack.append((start, maxIndex))
+        if maxDistance > toleranceSq:
+            stack[top, 0] = maxIndex
+            stack[top, 1] = end
+            top += 1
+            stack[top, 0] = start
+            stack[top, 1] = maxIndex
+            top += 1
         else:
-            results.append(line[start])
-
-    while len(stack):
-        processRange(*stack.pop())
-    # Each segment only appended its start point to the final result, so fill in
-    # the last point.
-    results.append(line[-1])
-    return results
+            keep[start] = True
+    return keep
+
+
+if numba:
+    _simplify3dKernel = numba.njit(cache=True)(_simplify3dKernel)
+
+
+def simplify3dLine(line, tolerance=1e-4):
+    """Simplify a line defined by a list of App.Vectors, while keeping the
+    maximum deviation from the original line within the defined tolerance.
+    Implementation of
+    https://en.wikipedia.org/wiki/Ramer%E2%80%93Douglas%E2%80%93Peucker_algorithm"""
+    pts = numpy.empty((len(line), 3))
+    for i, v in enumerate(line):
+        pts[i] = (v.x, v.y, v.z)
+    keep = _simplify3dKernel(pts, tolerance * tolerance)
+    return [line[i] for i in range(len(line)) if keep[i]]
 
 
 def RtoIJ(startpoint, command):
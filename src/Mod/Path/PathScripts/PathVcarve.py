@@ -31,12 +31,20 @@ import PathScripts.PathUtils as PathUtils
 import PathScripts.PathGeom as PathGeom
 import PathScripts.PathPreferences as PathPreferences
 
+import array
+import collections
 import traceback
 
 import math
+import numpy
 
 from PySide import QtCore
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
 __doc__ = "Class and implementation of Path Vcarve operation"
 
 PRIMARY   = 0
@@ -60,101 +68,365 @@ Vertex = {}
 
 _sorting = 'global'
 
+# set to True to retain the voronoi diagrams and vertex maps of the last
+# run in VD/Vertex for inspection - they hold on to a lot of memory
+_debug = False
+
+
+def _collectWiresKernel(ev0, ev1, row, adjacency, remaining, alive, knots):
+    # numerical core of _collectVoronoiWires, jit compiled when numba is
+    # available - emits 1 based edge ids, negative means use the Twin, with
+    # wires delimited by wireStart slices
+    m = len(ev0)
+    out = numpy.empty(m, numpy.int32)
+    wireStart = numpy.empty(m + 1, numpy.int32)
+    kAlive = numpy.ones(len(knots), numpy.bool_)
+    outN = 0
+    wireN = 0
+    wireStart[0] = 0
+    head = 0
+    while head < len(knots):
+        if not kAlive[head]:
+            head += 1
+            continue
+        vFirst = knots[head]
+        vLast  = vFirst
+        if remaining[vFirst] > 0:
+            vStart = vFirst
+            while vStart >= 0:
+                vLast = vStart
+                i = -1
+                for s in range(row[vStart], row[vStart + 1]):
+                    if alive[s]:
+                        i = adjacency[s]
+                        break
+                if i < 0:
+                    break
+                if vStart == ev0[i]:
+                    vEnd = ev1[i]
+                    out[outN] = i + 1
+                else:
+                    vEnd = ev0[i]
+                    out[outN] = -(i + 1)
+                outN += 1
+                for s in range(row[vStart], row[vStart + 1]):
+                    if alive[s] and adjacency[s] == i:
+                        alive[s] = False
+                        break
+                for s in range(row[vEnd], row[vEnd + 1]):
+                    if alive[s] and adjacency[s] == i:
+                        alive[s] = False
+                        break
+                remaining[vStart] -= 1
+                remaining[vEnd]   -= 1
+                if remaining[vEnd] == 0:
+                    vStart = -1
+                else:
+                    vStart = vEnd
+            wireN += 1
+            wireStart[wireN] = outN
+        if remaining[vFirst] == 0:
+            kAlive[head] = False
+        if remaining[vLast] == 0:
+            for k in range(head, len(knots)):
+                if kAlive[k] and knots[k] == vLast:
+                    kAlive[k] = False
+                    break
+    return (out[:outN], wireStart[:wireN + 1])
+
+
+def _sortWiresKernel(begin, end, pos):
+    # numerical core of _sortVoronoiWires, jit compiled when numba is
+    # available - returns the visit order and which wires to reverse
+    n = begin.shape[0]
+    order   = numpy.empty(n, numpy.int32)
+    reverse = numpy.zeros(n, numpy.bool_)
+    alive   = numpy.ones(n, numpy.bool_)
+    px = pos[0]
+    py = pos[1]
+    pz = pos[2]
+    for k in range(n):
+        bIdx = -1
+        eIdx = -1
+        bD = numpy.inf
+        eD = numpy.inf
+        for i in range(n):
+            if not alive[i]:
+                continue
+            dx = begin[i, 0] - px
+            dy = begin[i, 1] - py
+            dz = begin[i, 2] - pz
+            d = dx * dx + dy * dy + dz * dz
+            if d < bD:
+                bD = d
+                bIdx = i
+            dx = end[i, 0] - px
+            dy = end[i, 1] - py
+            dz = end[i, 2] - pz
+            d = dx * dx + dy * dy + dz * dz
+            if d < eD:
+                eD = d
+                eIdx = i
+        if bD < eD:
+            order[k] = bIdx
+            px = end[bIdx, 0]
+            py = end[bIdx, 1]
+            pz = end[bIdx, 2]
+            alive[bIdx] = False
+        else:
+            order[k] = eIdx
+            reverse[k] = True
+            px = begin[eIdx, 0]
+            py = begin[eIdx, 1]
+            pz = begin[eIdx, 2]
+            alive[eIdx] = False
+    return (order, reverse)
+
 
-def _collectVoronoiWires(vd):
-    edges = [e for e in vd.Edges if e.Color == PRIMARY]
-    vertex = {}
+if numba:
+    _collectWiresKernel = numba.njit(cache=True)(_collectWiresKernel)
+    _sortWiresKernel    = numba.njit(cache=True)(_sortWiresKernel)
+
+
+def _collectVoronoiWires(vd, edges=None):
+    if edges is None:
+        edges = [e for e in vd.Edges if e.Color == PRIMARY]
+    if not edges:
+        return []
+
+    # vertex indices of both endpoints of every primary edge
+    ev = []
+    maxV = 0
     for e in edges:
-        for v in e.Vertices:
-            i = v.Index
-            j = vertex.get(i, [])
-            j.append(e)
-            vertex[i] = j
-    Vertex.clear()
-    for v in vertex:
-        Vertex[v] = vertex[v]
-
-    # knots are the start and end points of a wire
-    knots = [i for i in vertex if len(vertex[i]) == 1]
-    knots.extend([i for i in vertex if len(vertex[i]) > 2])
+        # each Vertices access builds a fresh wrapper list in C++,
+        # so fetch it only once per edge
+        verts = e.Vertices
+        i0 = verts[0].Index
+        i1 = verts[1].Index
+        ev.append((i0, i1))
+        if i0 > maxV:
+            maxV = i0
+        if i1 > maxV:
+            maxV = i1
+
+    # CSR style adjacency - all edge ids of a vertex are stored in one
+    # contiguous slice adjacency[row[v]:row[v+1]], consuming an edge just
+    # clears its alive bit instead of rebuilding a list
+    remaining = array.array('i', [0] * (maxV + 1))
+    for i0, i1 in ev:
+        remaining[i0] += 1
+        remaining[i1] += 1
+
+    row = array.array('i', [0] * (maxV + 2))
+    for v in range(maxV + 1):
+        row[v + 1] = row[v] + remaining[v]
+
+    adjacency = array.array('i', [0] * row[maxV + 1])
+    fill = array.array('i', row[:maxV + 1])
+    for i, (i0, i1) in enumerate(ev):
+        adjacency[fill[i0]] = i
+        fill[i0] += 1
+        adjacency[fill[i1]] = i
+        fill[i1] += 1
+
+    alive = array.array('B', [1] * len(adjacency))
+
+    if _debug:
+        Vertex.clear()
+        for v in range(maxV + 1):
+            if remaining[v]:
+                Vertex[v] = [edges[adjacency[s]] for s in range(row[v], row[v + 1])]
+
+    # knots are the start and end points of a wire - classified in a
+    # single pass over the degrees, endpoints still sort before junctions
+    knots = []
+    junctions = []
+    for v in range(maxV + 1):
+        d = remaining[v]
+        if d == 1:
+            knots.append(v)
+        elif d > 2:
+            junctions.append(v)
+    knots.extend(junctions)
     if len(knots) == 0:
-        for i in vertex:
-            if len(vertex[i]) > 0:
-                knots.append(i)
+        for v in range(maxV + 1):
+            if remaining[v] > 0:
+                knots.append(v)
                 break
 
-    def consume(v, edge):
-        vertex[v] = [e for e in vertex[v] if e.Index != edge.Index]
-        return len(vertex[v]) == 0
+    if numba:
+        # marshal the adjacency into numpy arrays and run the jit
+        # compiled graph walk, then map the edge ids back to the wrappers
+        (out, wireStart) = _collectWiresKernel(
+                numpy.array([p[0] for p in ev], numpy.int32),
+                numpy.array([p[1] for p in ev], numpy.int32),
+                numpy.array(row,       numpy.int32),
+                numpy.array(adjacency, numpy.int32),
+                numpy.array(remaining, numpy.int32),
+                numpy.array(alive,     numpy.bool_),
+                numpy.array(knots,     numpy.int32))
+        wires = []
+        for w in range(len(wireStart) - 1):
+            we = []
+            for k in range(wireStart[w], wireStart[w + 1]):
+                i = int(out[k])
+                we.append(edges[i - 1] if i > 0 else edges[-i - 1].Twin)
+            wires.append(we)
+        return wires
 
-    def traverse(vStart, edge, edges):
-        if vStart == edge.Vertices[0].Index:
-            vEnd = edge.Vertices[1].Index
-            edges.append(edge)
+    def consume(v, i):
+        for s in range(row[v], row[v + 1]):
+            if alive[s] and adjacency[s] == i:
+                alive[s] = 0
+                break
+        remaining[v] -= 1
+        return remaining[v] == 0
+
+    # per vertex cursor over the adjacency slice - advancing it past dead
+    # slots keeps nextEdge amortized O(1) even for high degree knots
+    head = array.array('i', row[:maxV + 1])
+
+    def nextEdge(v):
+        if remaining[v] == 0:
+            return -1
+        s = head[v]
+        last = row[v + 1]
+        while s < last and not alive[s]:
+            s += 1
+        head[v] = s
+        if s < last:
+            return adjacency[s]
+        return -1
+
+    def traverse(vStart, i, we):
+        (i0, i1) = ev[i]
+        if vStart == i0:
+            vEnd = i1
+            we.append(edges[i])
         else:
-            vEnd = edge.Vertices[0].Index
-            edges.append(edge.Twin)
+            vEnd = i0
+            we.append(edges[i].Twin)
 
-        consume(vStart, edge)
-        if consume(vEnd, edge):
+        consume(vStart, i)
+        if consume(vEnd, i):
             return None
         return vEnd
 
+    # a set tracks which knots are still open so exhausted ones can be
+    # dropped in O(1) instead of rebuilding the knot list every wire
+    knotSet   = set(knots)
+    knotQueue = collections.deque(knots)
+
     wires = []
-    while knots:
+    while knotSet:
+        vFirst = knotQueue[0]
+        if vFirst not in knotSet:
+            knotQueue.popleft()
+            continue
         we = []
-        vFirst = knots[0]
         vStart = vFirst
         vLast  = vFirst
-        if len(vertex[vStart]):
+        if remaining[vFirst]:
             while vStart is not None:
-                vLast  = vStart
-                edges  = vertex[vStart]
-                if len(edges) > 0:
-                    edge   = edges[0]
-                    vStart = traverse(vStart, edge, we)
+                vLast = vStart
+                i = nextEdge(vStart)
+                if i >= 0:
+                    vStart = traverse(vStart, i, we)
                 else:
                     vStart = None
             wires.append(we)
-        if len(vertex[vFirst]) == 0:
-            knots = [v for v in knots if v != vFirst]
-        if len(vertex[vLast]) == 0:
-            knots = [v for v in knots if v != vLast]
+        if remaining[vFirst] == 0:
+            knotSet.discard(vFirst)
+        if remaining[vLast] == 0:
+            knotSet.discard(vLast)
     return wires
 
 
+def _sortOrder(begin, end, pos):
+    # nearest endpoint ordering over two (W,3) point arrays, comparing
+    # squared distances - returns the visit order and which wires have
+    # their end point closer than their begin point
+    if numba:
+        return _sortWiresKernel(begin, end, pos)
+
+    # consumed wires are swapped behind the active prefix instead of being
+    # masked with inf, so each round only scans the wires still left
+    idx = numpy.arange(len(begin))
+    n = len(begin)
+    order   = numpy.empty(n, numpy.int32)
+    reverse = numpy.zeros(n, numpy.bool_)
+
+    o = 0
+    while n:
+        d2b = ((begin[:n] - pos) ** 2).sum(1)
+        d2e = ((end[:n]   - pos) ** 2).sum(1)
+        bIdx = numpy.argmin(d2b)
+        eIdx = numpy.argmin(d2e)
+        if d2b[bIdx] < d2e[eIdx]:
+            k = bIdx
+            pos = end[k].copy()
+        else:
+            k = eIdx
+            reverse[o] = True
+            pos = begin[k].copy()
+        order[o] = idx[k]
+        o += 1
+        n -= 1
+        begin[[k, n]] = begin[[n, k]]
+        end[[k, n]]   = end[[n, k]]
+        idx[k], idx[n] = idx[n], idx[k]
+
+    return (order, reverse)
+
+
 def _sortVoronoiWires(wires, start=FreeCAD.Vector(0, 0, 0)):
-    def closestTo(start, point):
-        p = None
-        l = None
-        for i in point:
-            if l is None or l > start.distanceToPoint(point[i]):
-                l = start.distanceToPoint(point[i])
-                p = i
-        return (p, l)
-
-    begin = {}
-    end   = {}
+    # keep the begin/end points of all wires in two (W,3) arrays so each
+    # nearest neighbour lookup is a single vectorized reduction instead of
+    # a python loop over Vectors
+    begin = numpy.empty((len(wires), 3))
+    end   = numpy.empty((len(wires), 3))
 
     for i, w in enumerate(wires):
-        begin[i] = w[0].Vertices[0].toPoint()
-        end[i]   = w[-1].Vertices[1].toPoint()
+        b = w[0].Vertices[0].toPoint()
+        e = w[-1].Vertices[1].toPoint()
+        begin[i] = (b.x, b.y, b.z)
+        end[i]   = (e.x, e.y, e.z)
+
+    pos = numpy.array((start.x, start.y, start.z))
+    (order, reverse) = _sortOrder(begin, end, pos)
 
     result = []
-    while begin:
-        (bIdx, bLen) = closestTo(start, begin)
-        (eIdx, eLen) = closestTo(start, end)
-        if bLen < eLen:
-            result.append(wires[bIdx])
-            start =   end[bIdx]
-            del     begin[bIdx]
-            del       end[bIdx]
+    for k in range(len(order)):
+        i = int(order[k])
+        if reverse[k]:
+            result.append([e.Twin for e in reversed(wires[i])])
         else:
-            result.append([e.Twin for e in reversed(wires[eIdx])])
-            start = begin[eIdx]
-            del     begin[eIdx]
-            del       end[eIdx]
+            result.append(wires[i])
+    return result
+
+
+def _sortPartWires(wires, start=FreeCAD.Vector(0, 0, 0)):
+    # same ordering as _sortVoronoiWires but for wires of Part edges,
+    # which have no Twin - reversing flips each edge instead
+    begin = numpy.empty((len(wires), 3))
+    end   = numpy.empty((len(wires), 3))
+
+    for i, w in enumerate(wires):
+        b = w[0].valueAt(w[0].FirstParameter)
+        e = w[-1].valueAt(w[-1].LastParameter)
+        begin[i] = (b.x, b.y, b.z)
+        end[i]   = (e.x, e.y, e.z)
+
+    pos = numpy.array((start.x, start.y, start.z))
+    (order, reverse) = _sortOrder(begin, end, pos)
 
+    result = []
+    for k in range(len(order)):
+        i = int(order[k])
+        if reverse[k]:
+            result.append([PathGeom.flipEdge(e) for e in reversed(wires[i])])
+        else:
+            result.append(wires[i])
     return result
 
 class _Geometry(object):
@@ -164,6 +436,9 @@ class _Geometry(object):
         self.start = zStart
         self.stop  = zStop
         self.scale = zScale
+        # fold the per-call division into a multiplication
+        self.invScale = 1.0 / zScale
+        self.depthCache = {}
 
     @classmethod
     def FromTool(cls, tool, zStart, zFinal):
@@ -186,10 +461,22 @@ class _Geometry(object):
 def _calculate_depth(MIC, geom):
     # given a maximum inscribed circle (MIC) and tool angle,
     # return depth of cut relative to zStart.
-    depth = geom.start - round(MIC / geom.scale, 4)
-    PathLog.debug('zStart value: {} depth: {}'.format(geom.start, depth))
-
-    return max(depth, geom.stop)
+    # results are rounded to 4 decimals anyway, so memoize on the
+    # discretized MIC - the same widths show up over and over again
+    key = int(round(MIC * 10000))
+    depth = geom.depthCache.get(key)
+    if depth is None:
+        depth = geom.start - round(MIC * geom.invScale, 4)
+        if depth < geom.stop:
+            depth = geom.stop
+        PathLog.debug('zStart value: {} depth: {}'.format(geom.start, depth))
+        geom.depthCache[key] = depth
+    return depth
+
+def _calculate_depths(MICs, geom):
+    # batch version of _calculate_depth, operating on an (N,2) array of
+    # the begin/end widths of all edges of a wire in one numpy kernel
+    return numpy.maximum(geom.start - numpy.round(MICs * geom.invScale, 4), geom.stop)
 
 def _getPartEdge(edge, depths):
     dist = edge.getDistances()
@@ -197,6 +484,79 @@ def _getPartEdge(edge, depths):
     zEnd   = _calculate_depth(dist[1], depths)
     return edge.toShape(zBegin, zEnd)
 
+def _insertWires(vd, wires, discretize):
+    # a bulk addSegments binding submits the whole polygon with a
+    # single crossing into C++ - fall back to per segment insertion
+    # with the bound method hoisted if the binding doesn't have it
+    addSegments = getattr(vd, 'addSegments', None)
+    addSegment  = vd.addSegment
+    Vector      = FreeCAD.Vector
+    PathLog.debug('discretize value: {}'.format(discretize))
+    for wire in wires:
+        pts = wire.discretize(QuasiDeflection=discretize)
+
+        if addSegments:
+            ptv = [Vector(p.x, p.y) for p in pts]
+            ptv.append(ptv[0])
+            addSegments(ptv)
+        else:
+            # stream the segments - each point is wrapped exactly once and
+            # no intermediate closed point list is built
+            first = prev = Vector(pts[0].x, pts[0].y)
+            for p in pts[1:]:
+                cur = Vector(p.x, p.y)
+                addSegment(prev, cur)
+                prev = cur
+            addSegment(prev, first)
+
+def _buildFaceVoronoi(face, discretize, tolerance, colinear):
+    '''constructs, colors and collects the medial wires of one face'''
+    vd = Path.Voronoi()
+    _insertWires(vd, face.Wires, discretize)
+
+    vd.construct()
+
+    # every Edges access rebuilds the full wrapper list, so fetch it once
+    edges = vd.Edges
+    for e in edges:
+        e.Color = PRIMARY if e.isPrimary() else SECONDARY
+    vd.colorExterior(EXTERIOR1)
+    vd.colorExterior(EXTERIOR2,
+        lambda v: not face.isInside(v.toPoint(face.BoundBox.ZMin),
+        tolerance, True))
+    vd.colorColinear(COLINEAR, colinear)
+    vd.colorTwins(TWIN)
+
+    # reflect the final color tags into a dense array in a single pass and
+    # let numpy pick the primary edges instead of filtering per attribute
+    colors = numpy.fromiter((e.Color for e in edges), numpy.int8, len(edges))
+    primary = [edges[i] for i in numpy.where(colors == PRIMARY)[0]]
+
+    wires = _collectVoronoiWires(vd, primary)
+    if _sorting != 'global':
+        wires = _sortVoronoiWires(wires)
+    return (vd, wires)
+
+def _processFaceWorker(args):
+    '''worker for the parallel face processing - rebuilds the face from
+    its BRep string, runs the whole per face pipeline and returns the
+    finished part wires as BRep strings so they can be pickled back'''
+    (brep, discretize, tolerance, colinear, geomArgs) = args
+    face = Part.Shape()
+    face.importBrepFromString(brep)
+
+    (vd, wires) = _buildFaceVoronoi(face, discretize, tolerance, colinear)
+
+    geom = _Geometry(*geomArgs)
+    result = []
+    for w in wires:
+        dists  = numpy.array([e.getDistances() for e in w])
+        depths = _calculate_depths(dists, geom)
+        edges = [e.toShape(depths[i][0], depths[i][1]) for i, e in enumerate(w)]
+        if edges:
+            result.append(Part.makeCompound(edges).exportBrepToString())
+    return result
+
 class ObjectVcarve(PathEngraveBase.ObjectOp):
     '''Proxy class for Vcarve operation.'''
 
@@ -232,23 +592,60 @@ class ObjectVcarve(PathEngraveBase.ObjectOp):
         self.setupAdditionalProperties(obj)
 
     def _getPartEdges(self, obj, vWire, geom):
+        dists  = numpy.array([e.getDistances() for e in vWire])
+        depths = _calculate_depths(dists, geom)
         edges = []
-        for e in vWire:
-            edges.append(_getPartEdge(e, geom))
+        for i, e in enumerate(vWire):
+            edges.append(e.toShape(depths[i][0], depths[i][1]))
         return edges
 
+    def _buildPartWiresParallel(self, obj, faces, geom):
+        '''_buildPartWiresParallel(obj, faces, geom) ... process all faces
+        on a process pool, every face is fully independent. Returns the
+        part wires ready for path generation, or None if the pool cannot
+        be used so the caller falls back to the serial implementation.'''
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+            geomArgs = (geom.start, geom.stop, geom.scale)
+            args = [(f.exportBrepToString(), obj.Discretize, obj.Tolerance,
+                     obj.Colinear, geomArgs) for f in faces]
+            with ProcessPoolExecutor() as pool:
+                results = list(pool.map(_processFaceWorker, args))
+        except Exception as e:
+            PathLog.warning('parallel face processing not available ({}), processing serially'.format(e))
+            return None
+
+        partWires = []
+        for breps in results:
+            for brep in breps:
+                shape = Part.Shape()
+                shape.importBrepFromString(brep)
+                if shape.Edges:
+                    partWires.append(shape.Edges)
+        if _sorting == 'global':
+            partWires = _sortPartWires(partWires)
+        return partWires
+
     def buildPathMedial(self, obj, faces):
         '''constructs a medial axis path using openvoronoi'''
 
-        def insert_many_wires(vd, wires):
-            for wire in wires:
-                PathLog.debug('discretize value: {}'.format(obj.Discretize))
-                pts = wire.discretize(QuasiDeflection=obj.Discretize)
-                ptv = [FreeCAD.Vector(p.x, p.y) for p in pts]
-                ptv.append(ptv[0])
-
-                for i in range(len(pts)):
-                    vd.addSegment(ptv[i], ptv[i+1])
+        cmdCache = {}
+
+        def cmdsForEdge(e, hSpeed, vSpeed):
+            # straight edges with identical (rounded) endpoints produce
+            # identical commands, so cache those instead of re-formatting
+            # the same G-code over and over - curves are not cached
+            if type(e.Curve) != Part.Line and type(e.Curve) != Part.LineSegment:
+                return PathGeom.cmdsForEdge(e, hSpeed=hSpeed, vSpeed=vSpeed)
+            p0 = e.valueAt(e.FirstParameter)
+            p1 = e.valueAt(e.LastParameter)
+            key = (round(p0.x, 4), round(p0.y, 4), round(p0.z, 4),
+                   round(p1.x, 4), round(p1.y, 4), round(p1.z, 4))
+            cmds = cmdCache.get(key)
+            if cmds is None:
+                cmds = PathGeom.cmdsForEdge(e, hSpeed=hSpeed, vSpeed=vSpeed)
+                cmdCache[key] = cmds
+            return cmds
 
         def cutWire(edges):
             path = []
@@ -260,45 +657,40 @@ class ObjectVcarve(PathEngraveBase.ObjectOp):
             vSpeed = obj.ToolController.VertFeed.Value
             path.append(Path.Command("G1 X{} Y{} Z{} F{}".format(p.x, p.y, p.z, vSpeed)))
             for e in edges:
-                path.extend(PathGeom.cmdsForEdge(e, hSpeed=hSpeed, vSpeed=vSpeed))
+                path.extend(cmdsForEdge(e, hSpeed, vSpeed))
 
             return path
 
-        VD.clear()
-        voronoiWires = []
-        for f in faces:
-            vd = Path.Voronoi()
-            insert_many_wires(vd, f.Wires)
-
-            vd.construct()
-
-            for e in vd.Edges:
-                e.Color = PRIMARY if e.isPrimary() else SECONDARY
-            vd.colorExterior(EXTERIOR1)
-            vd.colorExterior(EXTERIOR2,
-                lambda v: not f.isInside(v.toPoint(f.BoundBox.ZMin),
-                obj.Tolerance, True))
-            vd.colorColinear(COLINEAR, obj.Colinear)
-            vd.colorTwins(TWIN)
-
-            wires = _collectVoronoiWires(vd)
-            if _sorting != 'global':
-                wires = _sortVoronoiWires(wires)
-            voronoiWires.extend(wires)
-            VD.append((f, vd, wires))
-
-        if _sorting == 'global':
-            voronoiWires = _sortVoronoiWires(voronoiWires)
-
         geom = _Geometry.FromObj(obj, self.model[0])
 
+        partWires = None
+        if len(faces) > 1 and not _debug:
+            partWires = self._buildPartWiresParallel(obj, faces, geom)
+
+        if partWires is None:
+            if _debug:
+                VD.clear()
+            voronoiWires = []
+            for f in faces:
+                (vd, wires) = _buildFaceVoronoi(f, obj.Discretize,
+                                                obj.Tolerance, obj.Colinear)
+                voronoiWires.extend(wires)
+                if _debug:
+                    VD.append((f, vd, wires))
+
+            if _sorting == 'global':
+                voronoiWires = _sortVoronoiWires(voronoiWires)
+
+            partWires = []
+            for w in voronoiWires:
+                pWire = self._getPartEdges(obj, w, geom)
+                if pWire:
+                    partWires.append(pWire)
+
         pathlist = []
         pathlist.append(Path.Command("(starting)"))
-        for w in voronoiWires:
-            pWire = self._getPartEdges(obj, w, geom)
-            if pWire:
-                wires.append(pWire)
-                pathlist.extend(cutWire(pWire))
+        for pWire in partWires:
+            pathlist.extend(cutWire(pWire))
         self.commandlist = pathlist
 
     def opExecute(self, obj):